@@ -4,6 +4,8 @@ quick_validate.py — Validate a skill package before delivery.
 
 Usage:
     python quick_validate.py <skill-name>
+    python quick_validate.py --dupes [--threshold 0.5]
+    python quick_validate.py --budget [--max-tokens N] [--max-skill-tokens N] [--max-ref-tokens N]
 
 Checks:
     1. SKILL.md exists
@@ -16,10 +18,32 @@ Checks:
     8. At least one Go/No-Go gate exists
     9. Constants block is not empty
    10. Rules block is not empty
+   11. Context budget: SKILL.md + listed references within token budgets
 
 Exit code 0 = all checks passed. Exit code 1 = failures found.
+
+Corpus mode (--dupes):
+    MinHash/LSH over every SKILL.md and references/*.md under SKILLS_ROOT.
+    Reports near-duplicate pairs (shingle Jaccard >= threshold) and their
+    clusters. Approximate: LSH banding is tuned for recall (~95% at the
+    threshold, higher above it), but a pair can still be missed. Per cluster it estimates removable bytes by keeping the largest
+    file and counting, for every other member, the share of its shingles
+    already present in that file. The upper bound (every non-largest member
+    fully redundant) is shown alongside.
+    Report only — always exits 0.
+
+Budget mode (--budget):
+    Ranks every skill by estimated tokens loaded (SKILL.md plus the files
+    listed in its "Reference Files" table), heaviest first. Exits 1 if any
+    skill or reference is over budget. Estimates are cached by content hash
+    in scripts/.context_budget_cache.json.
 """
 
+import argparse
+import hashlib
+import json
+import math
+import random
 import sys
 import re
 from pathlib import Path
@@ -37,6 +61,20 @@ REQUIRED_SECTIONS = [
 
 MAX_LINES = 500
 
+# Corpus duplicate detection
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+DUPE_THRESHOLD = 0.5
+LSH_MISS_WEIGHT = 0.95  # cost of a missed pair vs. a wasted candidate check
+_MERSENNE = (1 << 61) - 1
+
+# Context budgets (estimated tokens)
+MAX_SKILL_TOKENS = 6000      # SKILL.md alone
+MAX_REFERENCE_TOKENS = 2000  # any single listed reference
+MAX_CONTEXT_TOKENS = 10000   # SKILL.md + every listed reference
+TOKEN_CACHE_PATH = Path(__file__).resolve().parent / ".context_budget_cache.json"
+TOKEN_ESTIMATOR_VERSION = 1  # bump whenever estimate_tokens() changes
+
 
 class ValidationResult:
     def __init__(self):
@@ -95,7 +133,9 @@ def parse_frontmatter(content: str) -> dict:
     return fm
 
 
-def validate_skill(skill_name: str) -> ValidationResult:
+def validate_skill(skill_name: str, max_tokens: int = MAX_CONTEXT_TOKENS,
+                   max_skill_tokens: int = MAX_SKILL_TOKENS,
+                   max_ref_tokens: int = MAX_REFERENCE_TOKENS) -> ValidationResult:
     result = ValidationResult()
     skill_dir = SKILLS_ROOT / skill_name
     skill_md = skill_dir / "SKILL.md"
@@ -184,20 +224,364 @@ def validate_skill(skill_name: str) -> ValidationResult:
                 result.check(f"No duplication: {ref_file.name}", not duplicated,
                              "content duplicated in SKILL.md" if duplicated else "clean")
 
+    # Check 11: Context budget
+    cache = token_cache()
+    budget = context_budget(skill_dir, cache)
+    cache.save()
+    over = budget_violations(budget, max_tokens, max_skill_tokens, max_ref_tokens)
+    result.check("Context budget", not over,
+                 f"{budget['total_tokens']} tokens "
+                 f"(SKILL.md {budget['skill_tokens']}, {len(budget['references'])} references)"
+                 if not over else "; ".join(over))
+
     return result
 
 
+def corpus_files() -> list:
+    """Every SKILL.md and reference file under SKILLS_ROOT."""
+    files = sorted(SKILLS_ROOT.glob("*/SKILL.md"))
+    files += sorted(SKILLS_ROOT.glob("*/references/*.md"))
+    return files
+
+
+def shingles(content: str) -> set:
+    """Hashed word n-grams (whitespace/case/punctuation-insensitive)."""
+    words = re.findall(r"[a-z0-9]+", content.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    out = set()
+    for i in range(len(words) - SHINGLE_WORDS + 1):
+        gram = " ".join(words[i:i + SHINGLE_WORDS]).encode()
+        out.add(int.from_bytes(hashlib.blake2b(gram, digest_size=8).digest(), "little"))
+    return out
+
+
+def minhash(shingle_set: set, perms: list) -> tuple:
+    if not shingle_set:
+        return tuple([_MERSENNE] * len(perms))
+    return tuple(min((a * x + b) % _MERSENNE for x in shingle_set) for a, b in perms)
+
+
+def _integrate(f, lo: float, hi: float, steps: int = 100) -> float:
+    step = (hi - lo) / steps
+    return sum(f(lo + (i + 0.5) * step) for i in range(steps)) * step
+
+
+def lsh_bands(threshold: float, num_perm: int = NUM_PERM) -> tuple:
+    """Pick (bands, rows), bands * rows <= num_perm, favouring recall.
+
+    A pair with Jaccard s becomes a candidate with probability
+    1 - (1 - s^r)^b. Minimises the false-negative area above threshold,
+    weighted LSH_MISS_WEIGHT, plus the false-positive area below it. Missed
+    pairs are lost for good while false positives only cost an exact
+    Jaccard check, hence the heavy weighting (~95%+ recall at threshold).
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        for bands in range(1, num_perm // rows + 1):
+            def hit(s):
+                return 1 - (1 - s ** rows) ** bands
+            error = ((1 - LSH_MISS_WEIGHT) * _integrate(hit, 0.0, threshold)
+                     + LSH_MISS_WEIGHT * _integrate(lambda s: 1 - hit(s), threshold, 1.0))
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def find_duplicates(files: list, threshold: float = DUPE_THRESHOLD) -> tuple:
+    """Return (pairs, clusters) of near-duplicate files.
+
+    pairs:    [(similarity, path_a, path_b)], highest similarity first
+    clusters: [{"files": [...], "keep": path, "bytes": int, "dedupable": int,
+                "upper_bound": int}], most dedupable bytes first.
+              dedupable sums size * containment-in-keep over the non-kept
+              members; upper_bound is bytes minus the largest member.
+    Only LSH bucket collisions are compared, so cost stays near-linear in the
+    number of files instead of all-pairs; recall is high but not guaranteed.
+    """
+    rng = random.Random(1)  # fixed seed: stable signatures across runs
+    perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+    bands, rows = lsh_bands(threshold)
+
+    sets = [shingles(f.read_text()) for f in files]
+    sizes = [f.stat().st_size for f in files]
+    signatures = [minhash(s, perms) for s in sets]
+
+    candidates = set()
+    for band in range(bands):
+        buckets = {}
+        for idx, sig in enumerate(signatures):
+            key = sig[band * rows:(band + 1) * rows]
+            buckets.setdefault(key, []).append(idx)
+        for members in buckets.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+
+    parent = list(range(len(files)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    pairs = []
+    linked = set()
+    for i, j in candidates:
+        union = len(sets[i] | sets[j])
+        similarity = len(sets[i] & sets[j]) / union if union else 0.0
+        if similarity >= threshold:
+            pairs.append((similarity, files[i], files[j]))
+            parent[root(i)] = root(j)
+            linked.update((i, j))
+    pairs.sort(key=lambda p: (-p[0], str(p[1]), str(p[2])))
+
+    groups = {}
+    for i in linked:
+        groups.setdefault(root(i), []).append(i)
+    clusters = []
+    for members in groups.values():
+        keep = max(members, key=lambda m: sizes[m])
+        dedupable = 0
+        for m in members:
+            if m != keep and sets[m]:
+                # Single-linkage chains can join files that barely overlap
+                # the kept one, so only count what it already covers
+                dedupable += round(sizes[m] * len(sets[m] & sets[keep]) / len(sets[m]))
+        member_bytes = [sizes[m] for m in members]
+        clusters.append({
+            "files": sorted(files[m] for m in members),
+            "keep": files[keep],
+            "bytes": sum(member_bytes),
+            "dedupable": dedupable,
+            "upper_bound": sum(member_bytes) - sizes[keep],
+        })
+    clusters.sort(key=lambda c: -c["dedupable"])
+    return pairs, clusters
+
+
+class TokenCache:
+    """Token estimates keyed by sha256 of file content, persisted as JSON.
+
+    The file records TOKEN_ESTIMATOR_VERSION; a cache written by another
+    estimator version is discarded rather than served. save() keeps only
+    the digests measured since loading, so edited or deleted files do not
+    accumulate; call it once per run.
+    """
+
+    def __init__(self, path: Path = TOKEN_CACHE_PATH):
+        self.path = path
+        self.dirty = False
+        self.used = set()
+        try:
+            stored = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            stored = {}
+        if isinstance(stored, dict) and stored.get("estimator") == TOKEN_ESTIMATOR_VERSION:
+            self.entries = stored.get("entries", {})
+        else:
+            self.entries = {}
+
+    def measure(self, file: Path) -> tuple:
+        """Return (bytes, estimated tokens) for file."""
+        data = file.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        self.used.add(digest)
+        hit = self.entries.get(digest)
+        if hit is None:
+            hit = self.entries[digest] = [len(data), estimate_tokens(data.decode("utf-8", "replace"))]
+            self.dirty = True
+        return hit[0], hit[1]
+
+    def save(self):
+        if self.used != self.entries.keys():
+            self.entries = {d: self.entries[d] for d in self.used}
+            self.dirty = True
+        if not self.dirty:
+            return
+        try:
+            self.path.write_text(json.dumps(
+                {"estimator": TOKEN_ESTIMATOR_VERSION, "entries": self.entries},
+                separators=(",", ":")))
+            self.dirty = False
+        except OSError:
+            pass  # cache is an optimisation only
+
+
+_token_cache = None
+
+
+def token_cache() -> TokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCache()
+    return _token_cache
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: punctuation marks cost one token each,
+    words one token per ~4 characters."""
+    return sum(1 if not piece[0].isalnum() and piece[0] != "_" else math.ceil(len(piece) / 4)
+               for piece in re.findall(r"\w+|[^\w\s]", text))
+
+
+def parse_reference_table(content: str) -> list:
+    """Reference paths listed in the SKILL.md "Reference Files" table, in order."""
+    match = re.search(r"^#+\s+Reference Files\s*\n(.*?)(?=\n#+ |\n---|\Z)",
+                      content, re.DOTALL | re.MULTILINE)
+    if not match:
+        return []
+    refs = []
+    for line in match.group(1).splitlines():
+        if not line.strip().startswith("|"):
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if not cells or not cells[0] or set(cells[0]) <= set("-: ") or cells[0] == "File":
+            continue
+        path = cells[0].strip("`")
+        if path not in refs:
+            refs.append(path)
+    return refs
+
+
+def context_budget(skill_dir: Path, cache: TokenCache = None) -> dict:
+    """Bytes/tokens loaded for a skill: SKILL.md plus its listed references."""
+    cache = cache or token_cache()
+    skill_bytes, skill_tokens = cache.measure(skill_dir / "SKILL.md")
+    references = []
+    missing = []
+    for ref in parse_reference_table((skill_dir / "SKILL.md").read_text()):
+        ref_path = skill_dir / ref
+        if not ref_path.is_file():
+            missing.append(ref)
+            continue
+        ref_bytes, ref_tokens = cache.measure(ref_path)
+        references.append({"path": ref, "bytes": ref_bytes, "tokens": ref_tokens})
+    return {
+        "skill": skill_dir.name,
+        "skill_bytes": skill_bytes,
+        "skill_tokens": skill_tokens,
+        "references": references,
+        "missing": missing,
+        "total_bytes": skill_bytes + sum(r["bytes"] for r in references),
+        "total_tokens": skill_tokens + sum(r["tokens"] for r in references),
+    }
+
+
+def budget_violations(budget: dict, max_tokens: int = MAX_CONTEXT_TOKENS,
+                      max_skill_tokens: int = MAX_SKILL_TOKENS,
+                      max_ref_tokens: int = MAX_REFERENCE_TOKENS) -> list:
+    """Budget breaches for one skill, as human-readable strings."""
+    problems = []
+    if budget["total_tokens"] > max_tokens:
+        problems.append(f"total {budget['total_tokens']} > {max_tokens} tokens")
+    if budget["skill_tokens"] > max_skill_tokens:
+        problems.append(f"SKILL.md {budget['skill_tokens']} > {max_skill_tokens} tokens")
+    for ref in budget["references"]:
+        if ref["tokens"] > max_ref_tokens:
+            problems.append(f"{ref['path']} {ref['tokens']} > {max_ref_tokens} tokens")
+    for ref in budget["missing"]:
+        problems.append(f"{ref} listed but missing")
+    return problems
+
+
+def budget_report(max_tokens: int = MAX_CONTEXT_TOKENS,
+                  max_skill_tokens: int = MAX_SKILL_TOKENS,
+                  max_ref_tokens: int = MAX_REFERENCE_TOKENS) -> tuple:
+    """Ranked context-size report for every skill. Returns (text, over_budget_count)."""
+    cache = token_cache()
+    budgets = [context_budget(f.parent, cache) for f in sorted(SKILLS_ROOT.glob("*/SKILL.md"))]
+    cache.save()
+    budgets.sort(key=lambda b: -b["total_tokens"])
+
+    lines = [f"  Budgets: total {max_tokens}, SKILL.md {max_skill_tokens}, "
+             f"reference {max_ref_tokens} tokens", ""]
+    lines.append(f"  {'#':>3}  {'Skill':<24} {'Tokens':>7} {'Bytes':>8} {'SKILL.md':>8} {'Refs':>6}")
+    over_count = 0
+    for rank, b in enumerate(budgets, 1):
+        over = budget_violations(b, max_tokens, max_skill_tokens, max_ref_tokens)
+        over_count += bool(over)
+        marker = "FAIL" if over else ""
+        lines.append(f"  {rank:>3}  {b['skill']:<24} {b['total_tokens']:>7} {b['total_bytes']:>8} "
+                     f"{b['skill_tokens']:>8} {b['total_tokens'] - b['skill_tokens']:>6}  {marker}".rstrip())
+        for ref in sorted(b["references"], key=lambda r: -r["tokens"]):
+            lines.append(f"       {'':<24} {ref['tokens']:>7} {ref['bytes']:>8}  {ref['path']}")
+        for problem in over:
+            lines.append(f"       — {problem}")
+    lines.append("")
+    lines.append(f"  Total: {sum(b['total_tokens'] for b in budgets)} tokens across "
+                 f"{len(budgets)} skills, {over_count} over budget")
+    return "\n".join(lines), over_count
+
+
+def dupes_report(threshold: float = DUPE_THRESHOLD) -> str:
+    files = corpus_files()
+    pairs, clusters = find_duplicates(files, threshold)
+
+    def rel(f):
+        return f.relative_to(SKILLS_ROOT).as_posix()
+
+    lines = [f"  Scanned {len(files)} files, threshold {threshold:.2f}", ""]
+    lines.append(f"  Near-duplicate pairs: {len(pairs)}")
+    for similarity, a, b in pairs:
+        lines.append(f"    {similarity:.2f}  {rel(a)}  <->  {rel(b)}")
+    lines.append("")
+    lines.append(f"  Clusters: {len(clusters)}")
+    for n, cluster in enumerate(clusters, 1):
+        lines.append(f"    #{n}: {len(cluster['files'])} files, {cluster['bytes']} bytes, "
+                     f"~{cluster['dedupable']} dedupable (upper bound {cluster['upper_bound']})")
+        for f in cluster["files"]:
+            lines.append(f"        {rel(f)}" + ("  (keep)" if f == cluster["keep"] else ""))
+    total = sum(c["dedupable"] for c in clusters)
+    upper = sum(c["upper_bound"] for c in clusters)
+    lines.append("")
+    lines.append(f"  Total dedupable: ~{total} bytes (upper bound {upper})")
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill-name>")
+    parser = argparse.ArgumentParser(description="Validate a skill package before delivery.")
+    parser.add_argument("skill_name", nargs="?", help="e.g. pdf-converter")
+    parser.add_argument("--dupes", action="store_true",
+                        help="report near-duplicate files across the whole skills corpus")
+    parser.add_argument("--threshold", type=float, default=DUPE_THRESHOLD,
+                        help=f"Jaccard similarity for --dupes (default {DUPE_THRESHOLD})")
+    parser.add_argument("--budget", action="store_true",
+                        help="rank every skill by estimated context tokens and enforce budgets")
+    parser.add_argument("--max-tokens", type=int, default=MAX_CONTEXT_TOKENS,
+                        help=f"budget for SKILL.md + references (default {MAX_CONTEXT_TOKENS})")
+    parser.add_argument("--max-skill-tokens", type=int, default=MAX_SKILL_TOKENS,
+                        help=f"budget for SKILL.md alone (default {MAX_SKILL_TOKENS})")
+    parser.add_argument("--max-ref-tokens", type=int, default=MAX_REFERENCE_TOKENS,
+                        help=f"budget per reference file (default {MAX_REFERENCE_TOKENS})")
+    args = parser.parse_args()
+
+    if args.budget:
+        print(f"Context budget: {SKILLS_ROOT.name}/")
+        print()
+        report, over_count = budget_report(args.max_tokens, args.max_skill_tokens,
+                                           args.max_ref_tokens)
+        print(report)
+        sys.exit(1 if over_count else 0)
+
+    if args.dupes:
+        print(f"Duplicate scan: {SKILLS_ROOT.name}/")
+        print()
+        print(dupes_report(args.threshold))
+        sys.exit(0)
+
+    if not args.skill_name:
+        parser.print_usage()
         print("  Example: python quick_validate.py pdf-converter")
         sys.exit(1)
 
-    skill_name = sys.argv[1]
+    skill_name = args.skill_name
     print(f"Validating: skills/{skill_name}/")
     print()
 
-    result = validate_skill(skill_name)
+    result = validate_skill(skill_name, args.max_tokens, args.max_skill_tokens,
+                            args.max_ref_tokens)
     print(result.report())
 
     if result.all_passed:
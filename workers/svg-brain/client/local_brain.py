@@ -0,0 +1,429 @@
+"""Offline hybrid search engine mirroring svg-brain POST /query.
+
+Same pipeline as src/app/search.ts, run locally for CI and air-gapped use:
+BM25 over an inverted index (stands in for FTS5), cosine over a NumPy
+embedding matrix (stands in for Vectorize), fused with Reciprocal Rank
+Fusion (k=60). Responses have the /query shape:
+    {query, domain, results: [QueryResult], count}
+
+Indexes law/doctrine/*.md (domain "doctrine") and
+factory/agents/*/references/*.md (domain "agents"), chunked with the same
+512/100 recursive splitter as src/app/chunker.ts.
+
+Embeddings are deterministic hashed unigram+bigram vectors, not
+bge-large-en-v1.5 — there is no model offline — so vector scores are
+lexical-semantic at best. Rankings will be close to, not identical with,
+production.
+
+The index lives on disk (default workers/svg-brain/.local-index/) as .npy
+arrays opened memory-mapped. build() is incremental: documents whose
+content hash is unchanged keep their chunks and embedding rows; only new
+or edited files are re-chunked and re-embedded. Requires numpy.
+
+Usage:
+    python local_brain.py build
+    python local_brain.py query "fail closed CI" --domain doctrine --top-k 5
+
+    from local_brain import LocalBrain
+    brain = LocalBrain.open()          # builds/refreshes as needed
+    brain.query("rollback protocol", top_k=5)
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_INDEX_DIR = Path(
+    os.environ.get("SVG_BRAIN_INDEX_DIR", Path(__file__).resolve().parent.parent / ".local-index")
+)
+
+# (directory under REPO_ROOT, glob, domain) — domains match scripts/seed.ts DOMAIN_MAP
+SOURCES = [
+    ("law/doctrine", "*.md", "doctrine"),
+    ("factory/agents", "*/references/*.md", "agents"),
+]
+
+INDEX_VERSION = 1
+
+# Mirrors src/app/chunker.ts
+CHUNK_SIZE = 512
+CHUNK_OVERLAP = 100
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+# Mirrors src/app/search.ts
+RRF_K = 60
+DEFAULT_TOP_K = 10
+MAX_TOP_K = 50
+
+EMBED_DIM = 384
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# ── Chunking (port of src/app/chunker.ts) ──────────────────────
+
+def _hard_split(text: str, size: int, overlap: int) -> list:
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        chunks.append(text[start:end])
+        start = end - overlap
+        if end >= len(text):
+            break
+    return chunks
+
+
+def _recursive_split(text: str, separators: list, size: int, overlap: int) -> list:
+    if len(text) <= size:
+        return [text] if text.strip() else []
+    separator = next((s for s in separators if s == "" or s in text), "")
+    if separator == "":
+        return _hard_split(text, size, overlap)
+
+    chunks = []
+    current = ""
+    for part in text.split(separator):
+        candidate = current + separator + part if current else part
+        if len(candidate) > size and current:
+            chunks.append(current)
+            current = current[max(0, len(current) - overlap):] + separator + part
+        else:
+            current = candidate
+    if current.strip():
+        chunks.append(current)
+
+    remaining = separators[separators.index(separator) + 1:]
+    result = []
+    for chunk in chunks:
+        if len(chunk) > size and remaining:
+            result.extend(_recursive_split(chunk, remaining, size, overlap))
+        else:
+            result.append(chunk)
+    return [c for c in result if c.strip()]
+
+
+def chunk_text(content: str) -> list:
+    return [c.strip() for c in _recursive_split(content, SEPARATORS, CHUNK_SIZE, CHUNK_OVERLAP)]
+
+
+# ── Text features ──────────────────────────────────────────────
+
+def tokenize(text: str) -> list:
+    """Lowercased alphanumeric runs — close to FTS5's unicode61 tokenizer."""
+    return TOKEN_RE.findall(text.lower())
+
+
+_feature_cache = {}
+
+
+def _feature(token: str):
+    hit = _feature_cache.get(token)
+    if hit is None:
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        hit = _feature_cache[token] = (h % EMBED_DIM, 1.0 if (h >> 63) & 1 else -1.0)
+    return hit
+
+
+def embed(text: str) -> np.ndarray:
+    """Deterministic hashed unigram+bigram embedding, L2-normalized."""
+    tokens = tokenize(text)
+    feats = Counter(tokens)
+    feats.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    vec = np.zeros(EMBED_DIM, dtype=np.float32)
+    for feat, tf in feats.items():
+        idx, sign = _feature(feat)
+        vec[idx] += sign * (1.0 + math.log(tf))
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def extract_title(content: str, source_path: str) -> str:
+    """Same rule as scripts/seed.ts: first H1, else the file name."""
+    match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+    if match:
+        return match.group(1).strip()
+    return source_path.rsplit("/", 1)[-1].replace(".md", "")
+
+
+# ── Index build ────────────────────────────────────────────────
+
+def discover(root: Path = REPO_ROOT) -> dict:
+    """Map source_path -> (absolute path, domain) for every indexed file."""
+    found = {}
+    for base, pattern, domain in SOURCES:
+        for path in sorted((root / base).glob(pattern)):
+            if path.is_file():
+                found[path.relative_to(root).as_posix()] = (path, domain)
+    return found
+
+
+def _save_npy(index_dir: Path, name: str, array: np.ndarray):
+    tmp = index_dir / f"{name}.tmp.npy"
+    np.save(tmp, array)
+    os.replace(tmp, index_dir / f"{name}.npy")
+
+
+def _save_json(index_dir: Path, name: str, data):
+    tmp = index_dir / f"{name}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, index_dir / name)
+
+
+def _load_previous(index_dir: Path):
+    try:
+        with open(index_dir / "manifest.json") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION or manifest.get("dim") != EMBED_DIM:
+            return None
+        with open(index_dir / "chunks.json") as f:
+            chunks = json.load(f)
+        embeddings = np.load(index_dir / "embeddings.npy", mmap_mode="r")
+        # Arrays must describe the same rows the manifest's offsets point at
+        if embeddings.shape != (len(chunks), EMBED_DIM):
+            return None
+        for doc in manifest["documents"].values():
+            if doc["start"] < 0 or doc["start"] + doc["count"] > len(chunks):
+                return None
+        return manifest, chunks, embeddings
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def build(root: Path = REPO_ROOT, index_dir: Path = DEFAULT_INDEX_DIR) -> dict:
+    """Build or incrementally refresh the on-disk index.
+
+    Returns stats: {documents, chunks, added, changed, removed, reused}.
+    Nothing is written when no source file has changed.
+    """
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    previous = _load_previous(index_dir)
+    old_docs = previous[0]["documents"] if previous else {}
+
+    files = discover(Path(root))
+    stats = {"documents": len(files), "added": 0, "changed": 0, "removed": 0, "reused": 0}
+    stats["removed"] = len(set(old_docs) - set(files))
+
+    docs = {}
+    chunks = []
+    vectors = []
+    for source_path, (path, domain) in files.items():
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        old = old_docs.get(source_path)
+        start = len(chunks)
+
+        if old and old["sha256"] == digest and old["domain"] == domain:
+            stats["reused"] += 1
+            s, n = old["start"], old["count"]
+            chunks.extend(previous[1][s:s + n])
+            vectors.append(np.asarray(previous[2][s:s + n]))
+            doc = dict(old)
+        else:
+            stats["changed" if old else "added"] += 1
+            content = raw.decode("utf-8", errors="replace")
+            document_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"svg-brain:{source_path}"))
+            texts = chunk_text(content)
+            for i, text in enumerate(texts):
+                chunks.append({
+                    "chunk_id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{document_id}:{digest}:{i}")),
+                    "document_id": document_id,
+                    "content": text,
+                })
+            vectors.append(np.stack([embed(t) for t in texts]) if texts
+                           else np.zeros((0, EMBED_DIM), dtype=np.float32))
+            doc = {
+                "document_id": document_id,
+                "sha256": digest,
+                "domain": domain,
+                "title": extract_title(content, source_path),
+            }
+        doc["start"] = start
+        doc["count"] = len(chunks) - start
+        docs[source_path] = doc
+
+    stats["chunks"] = len(chunks)
+    if previous and not (stats["added"] or stats["changed"] or stats["removed"]):
+        return stats
+
+    embeddings = (np.concatenate(vectors) if vectors
+                  else np.zeros((0, EMBED_DIM), dtype=np.float32)).astype(np.float32)
+
+    # Inverted index in CSR form: postings for term t live at
+    # post_chunks/post_tfs[offsets[t]:offsets[t + 1]]
+    postings = {}
+    lengths = np.zeros(len(chunks), dtype=np.float32)
+    for row, chunk in enumerate(chunks):
+        counts = Counter(tokenize(chunk["content"]))
+        lengths[row] = sum(counts.values())
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((row, tf))
+    vocab = {}
+    offsets = np.zeros(len(postings) + 1, dtype=np.int64)
+    post_chunks, post_tfs = [], []
+    for t, term in enumerate(sorted(postings)):
+        vocab[term] = t
+        plist = postings[term]
+        offsets[t + 1] = offsets[t] + len(plist)
+        post_chunks.extend(r for r, _ in plist)
+        post_tfs.extend(tf for _, tf in plist)
+
+    # Drop the old manifest first: if the build dies part-way, the index
+    # reads as absent (full rebuild) rather than old offsets over new arrays
+    try:
+        os.unlink(index_dir / "manifest.json")
+    except FileNotFoundError:
+        pass
+    _save_npy(index_dir, "embeddings", embeddings)
+    _save_npy(index_dir, "chunk_lengths", lengths)
+    _save_npy(index_dir, "post_offsets", offsets)
+    _save_npy(index_dir, "post_chunks", np.asarray(post_chunks, dtype=np.int32))
+    _save_npy(index_dir, "post_tfs", np.asarray(post_tfs, dtype=np.float32))
+    _save_json(index_dir, "vocab.json", vocab)
+    _save_json(index_dir, "chunks.json", chunks)
+    # Manifest last: it is what marks the index as complete
+    _save_json(index_dir, "manifest.json", {
+        "version": INDEX_VERSION,
+        "dim": EMBED_DIM,
+        "documents": docs,
+    })
+    return stats
+
+
+# ── Query ──────────────────────────────────────────────────────
+
+class LocalBrain:
+    """Read-only view over a built index. Arrays are memory-mapped."""
+
+    def __init__(self, index_dir: Path = DEFAULT_INDEX_DIR):
+        index_dir = Path(index_dir)
+        with open(index_dir / "manifest.json") as f:
+            manifest = json.load(f)
+        with open(index_dir / "chunks.json") as f:
+            self.chunks = json.load(f)
+        with open(index_dir / "vocab.json") as f:
+            self.vocab = json.load(f)
+
+        def load(name):
+            return np.load(index_dir / f"{name}.npy", mmap_mode="r")
+
+        self.embeddings = load("embeddings")
+        self.lengths = load("chunk_lengths")
+        self.offsets = load("post_offsets")
+        self.post_chunks = load("post_chunks")
+        self.post_tfs = load("post_tfs")
+        self.avgdl = float(self.lengths.mean()) if len(self.lengths) else 0.0
+
+        # Per-chunk document metadata for hydration and domain filtering
+        self.documents = {}
+        domains = [""] * len(self.chunks)
+        for source_path, doc in manifest["documents"].items():
+            self.documents[doc["document_id"]] = dict(doc, source_path=source_path)
+            domains[doc["start"]:doc["start"] + doc["count"]] = [doc["domain"]] * doc["count"]
+        self.chunk_domains = np.asarray(domains)
+
+    @classmethod
+    def open(cls, index_dir: Path = DEFAULT_INDEX_DIR, root: Path = REPO_ROOT,
+             refresh: bool = True) -> "LocalBrain":
+        """Open the index, building or incrementally refreshing it first."""
+        if refresh:
+            build(root, index_dir)
+        return cls(index_dir)
+
+    def _top(self, scores: np.ndarray, mask, limit: int) -> list:
+        candidates = np.flatnonzero(mask & (scores > 0)) if mask is not None \
+            else np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
+
+    def bm25_search(self, query: str, limit: int, mask=None) -> list:
+        n = len(self.chunks)
+        scores = np.zeros(n, dtype=np.float32)
+        for term in set(tokenize(query)):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            lo, hi = int(self.offsets[t]), int(self.offsets[t + 1])
+            rows = self.post_chunks[lo:hi]
+            tf = self.post_tfs[lo:hi]
+            df = hi - lo
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self.lengths[rows] / self.avgdl)
+            scores[rows] += idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        return self._top(scores, mask, limit)
+
+    def vector_search(self, query: str, limit: int, mask=None) -> list:
+        if not len(self.chunks):
+            return []
+        scores = self.embeddings @ embed(query)
+        return self._top(scores, mask, limit)
+
+    def query(self, query: str, domain: str = None, top_k: int = DEFAULT_TOP_K) -> dict:
+        """Hybrid search with the same request/response shape as POST /query."""
+        if not query or not isinstance(query, str):
+            raise ValueError("query is required (string)")
+        top_k = min(top_k, MAX_TOP_K)
+        mask = self.chunk_domains == domain if domain else None
+
+        fts = self.bm25_search(query, top_k * 2, mask)
+        vec = self.vector_search(query, top_k * 2, mask)
+        fused = {}
+        for rank, row in enumerate(fts, 1):
+            fused[row] = 1.0 / (RRF_K + rank)
+        for rank, row in enumerate(vec, 1):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (RRF_K + rank)
+        ranked = sorted(fused.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+
+        results = []
+        for row, score in ranked:
+            chunk = self.chunks[row]
+            doc = self.documents[chunk["document_id"]]
+            results.append({
+                "chunk_id": chunk["chunk_id"],
+                "document_id": chunk["document_id"],
+                "content": chunk["content"],
+                "score": score,
+                "source_path": doc["source_path"],
+                "title": doc["title"],
+                "domain": doc["domain"],
+            })
+        return {
+            "query": query,
+            "domain": domain if domain else "all",
+            "results": results,
+            "count": len(results),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline svg-brain hybrid search")
+    parser.add_argument("--index-dir", type=Path, default=DEFAULT_INDEX_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Build or incrementally refresh the index")
+    q = sub.add_parser("query", help="Run a /query-shaped search")
+    q.add_argument("query")
+    q.add_argument("--domain")
+    q.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build(index_dir=args.index_dir)
+        print(json.dumps(stats))
+        sys.exit(0)
+
+    brain = LocalBrain.open(args.index_dir)
+    print(json.dumps(brain.query(args.query, args.domain, args.top_k), indent=2))
@@ -0,0 +1,254 @@
+"""Python client for the svg-brain knowledge layer API.
+
+Aligned with docs/openapi.yaml (hybridSearch, healthCheck). One pooled
+keep-alive session is shared by every call, repeated (query, domain, top_k)
+lookups are served from a TTL+LRU cache, and concurrent identical lookups
+share a single in-flight request — a planning run never hits the network
+twice for the same doctrine query.
+
+Usage:
+    from svg_brain_client import SvgBrainClient
+
+    with SvgBrainClient() as brain:              # SVG_BRAIN_URL / SVG_BRAIN_API_KEY
+        hits = brain.query("fail closed", domain="doctrine", top_k=5)
+        batch = brain.query_many(["CTB", "rollback protocol"])
+
+    # asyncio fan-out
+    results = await brain.aquery_many(["CTB", "HEIR", "ORBT"], domain="doctrine")
+"""
+import asyncio
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://svg-brain.svg-outreach.workers.dev"
+
+# /query requestBody limits from openapi.yaml
+DEFAULT_TOP_K = 10
+MAX_TOP_K = 50
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CACHE_TTL = 900  # seconds
+DEFAULT_CACHE_SIZE = 1024
+
+
+class SvgBrainError(Exception):
+    """Raised for non-2xx responses and transport failures."""
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache keyed on (query, domain, top_k).
+
+    Stats: hits (served from cache), shared (waited on another caller's
+    in-flight request), misses (went to the network).
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def record(self, stat: str):
+        with self._lock:
+            setattr(self, stat, getattr(self, stat) + 1)
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SvgBrainClient:
+    """Pooled, cached client for svg-brain."""
+
+    def __init__(self, base_url: str = None, api_key: str = None,
+                 timeout: float = DEFAULT_TIMEOUT, pool_size: int = DEFAULT_POOL_SIZE,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.base_url = (base_url or os.environ.get("SVG_BRAIN_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.cache = QueryCache(cache_ttl, cache_size)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        api_key = api_key or os.environ.get("SVG_BRAIN_API_KEY")
+        if api_key:
+            self.session.headers["X-API-Key"] = api_key
+
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._executor = None
+
+    # ── lifecycle ────────────────────────────────────────────────
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── transport ────────────────────────────────────────────────
+
+    def _request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            resp = self.session.request(method, f"{self.base_url}{path}",
+                                        timeout=self.timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            raise SvgBrainError(f"{method} {path}: {e}") from e
+        if not 200 <= resp.status_code < 300:
+            raise SvgBrainError(f"{method} {path}: HTTP {resp.status_code} {resp.text[:200]}",
+                                status=resp.status_code)
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise SvgBrainError(f"{method} {path}: non-JSON response {resp.text[:200]!r}",
+                                status=resp.status_code) from e
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    # ── /query ───────────────────────────────────────────────────
+
+    @staticmethod
+    def _key(query: str, domain: str = None, top_k: int = DEFAULT_TOP_K):
+        if not query or not query.strip():
+            raise ValueError("query must be a non-empty string")
+        if not 1 <= top_k <= MAX_TOP_K:
+            raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+        return (query, domain or None, top_k)
+
+    def query(self, query: str, domain: str = None, top_k: int = DEFAULT_TOP_K) -> dict:
+        """Hybrid search. Returns the /query response body
+        ({query, domain, results: [QueryResult], count})."""
+        key = self._key(query, domain, top_k)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.record("hits")
+            return copy.deepcopy(cached)
+
+        # Share one request between concurrent callers asking the same thing
+        with self._inflight_lock:
+            fut = self._inflight.get(key)
+            if fut is None:
+                # The previous owner may have finished since the cache miss
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.cache.record("hits")
+                    return copy.deepcopy(cached)
+            owner = fut is None
+            if owner:
+                fut = self._inflight[key] = Future()
+        if not owner:
+            self.cache.record("shared")
+            return copy.deepcopy(fut.result())
+        self.cache.record("misses")
+
+        try:
+            body = {"query": key[0], "top_k": key[2]}
+            if key[1]:
+                body["domain"] = key[1]
+            data = self._request("POST", "/query", json=body)
+            self.cache.put(key, data)
+            fut.set_result(data)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+        return copy.deepcopy(data)
+
+    def _normalize(self, queries, domain, top_k):
+        """Accept strings, (query, domain, top_k) tuples or dicts."""
+        out = []
+        for q in queries:
+            if isinstance(q, str):
+                out.append((q, domain, top_k))
+            elif isinstance(q, dict):
+                out.append((q["query"], q.get("domain", domain), q.get("top_k", top_k)))
+            else:
+                q = tuple(q)
+                out.append((q[0],
+                            q[1] if len(q) > 1 else domain,
+                            q[2] if len(q) > 2 else top_k))
+        return out
+
+    def query_many(self, queries, domain: str = None, top_k: int = DEFAULT_TOP_K) -> list:
+        """Run many lookups concurrently over the pooled session.
+
+        Results come back in input order. Duplicates are resolved once.
+        """
+        items = self._normalize(queries, domain, top_k)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size)
+        futures = [self._executor.submit(self.query, *item) for item in items]
+        return [f.result() for f in futures]
+
+    # ── asyncio interface ────────────────────────────────────────
+
+    async def aquery(self, query: str, domain: str = None, top_k: int = DEFAULT_TOP_K) -> dict:
+        key = self._key(query, domain, top_k)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.record("hits")
+            return copy.deepcopy(cached)
+        return await asyncio.to_thread(self.query, *key)
+
+    async def aquery_many(self, queries, domain: str = None, top_k: int = DEFAULT_TOP_K,
+                          concurrency: int = None, return_exceptions: bool = False) -> list:
+        """Fan out many lookups; at most `concurrency` (default pool_size)
+        are on the wire at once so the connection pool is never exceeded."""
+        sem = asyncio.Semaphore(concurrency or self.pool_size)
+
+        async def one(item):
+            async with sem:
+                return await self.aquery(*item)
+
+        return await asyncio.gather(*(one(i) for i in self._normalize(queries, domain, top_k)),
+                                    return_exceptions=return_exceptions)
@@ -0,0 +1,131 @@
+"""Offline check for composio_probe against a local stand-in HTTP server.
+
+Usage:
+    python check_composio_probe.py
+
+Starts an http.server stub on a free localhost port with these endpoints:
+    /slow       sleeps past the per-candidate timeout, then 200
+    /flaky      503 on the first hit, 201 after
+    /rejected   404
+    /ok         200
+    /ok-too     200
+    /hang-post  sleeps past the timeout (read timeout — must not be resent)
+
+and asserts first-2xx-wins, per-candidate timeouts, 503 retry with backoff,
+no POST resend after a read timeout, duplicate-2xx reporting, and that a
+candidate skipped because another already won is marked as never sent.
+
+Exit code 0 = all checks passed. Exit code 1 = failures found.
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from composio_probe import NOT_SENT, Candidate, _probe_one, probe
+
+SLOW_SECONDS = 1.0
+hits = {}
+hits_lock = threading.Lock()
+
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with hits_lock:
+            hits[self.path] = hits.get(self.path, 0) + 1
+            n = hits[self.path]
+        if self.path in ("/slow", "/hang-post"):
+            time.sleep(SLOW_SECONDS)
+            code = 200
+        elif self.path == "/flaky":
+            code = 503 if n == 1 else 201
+        elif self.path in ("/ok", "/ok-too"):
+            code = 200
+        else:
+            code = 404
+        body = b'{"ok":true}'
+        try:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client already gave up (timeout case)
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def check(self, name: str, passed: bool, detail: str = ""):
+        marker = "  PASS" if passed else "  FAIL"
+        print(f"{marker}: {name}" + (f" — {detail}" if detail else ""))
+        self.failed += not passed
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    checks = Checks()
+
+    # 1. First 2xx wins; slow candidate cut off by its own timeout
+    hits.clear()
+    started = time.monotonic()
+    winner, attempts = probe([
+        Candidate("POST", f"{base}/rejected", {}),
+        Candidate("POST", f"{base}/slow", {}, timeout=0.3),
+        Candidate("POST", f"{base}/flaky", {}),
+    ], backoff=0.1)
+    elapsed = time.monotonic() - started
+    checks.check("first 2xx wins", winner is not None and winner.candidate.url.endswith("/flaky"),
+                 winner.candidate.url if winner else "no winner")
+    checks.check("503 retried with backoff", winner is not None and winner.tries == 2,
+                 f"{winner.tries if winner else 0} tries")
+    slow = next((a for a in attempts if a.candidate.url.endswith("/slow")), None)
+    checks.check("per-candidate timeout honoured",
+                 slow is not None and slow.status is None and elapsed < SLOW_SECONDS,
+                 f"slow: {slow.error if slow else 'not reported'}, total {elapsed:.2f}s")
+    checks.check("every candidate reported", len(attempts) == 3, f"{len(attempts)} attempts")
+
+    # 2. POST is not resent after a read timeout
+    hits.clear()
+    winner, attempts = probe([Candidate("POST", f"{base}/hang-post", {}, timeout=0.2)],
+                             retries=3, backoff=0.05)
+    time.sleep(SLOW_SECONDS)
+    checks.check("no POST resend after read timeout", winner is None and hits.get("/hang-post") == 1,
+                 f"{hits.get('/hang-post', 0)} hits")
+
+    # 3. Two accepting endpoints are both reported
+    hits.clear()
+    winner, attempts = probe([
+        Candidate("POST", f"{base}/ok", {}),
+        Candidate("POST", f"{base}/ok-too", {}),
+    ])
+    accepted = [a for a in attempts if a.ok]
+    checks.check("duplicate 2xx reported", len(accepted) == 2, f"{len(accepted)} accepted")
+
+    # 4. A candidate whose thread starts after a winner is never sent
+    hits.clear()
+    stop = threading.Event()
+    stop.set()
+    attempt = _probe_one(None, Candidate("POST", f"{base}/ok", {}), 1, 2, 0.1, stop)
+    checks.check("never-sent attempt marked",
+                 attempt.tries == 0 and attempt.status is None and attempt.error == NOT_SENT
+                 and not hits, f"tries={attempt.tries} error={attempt.error!r}")
+
+    server.shutdown()
+    print()
+    print(f"  Result: {'all passed' if not checks.failed else f'{checks.failed} failed'}")
+    return 1 if checks.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Concurrent endpoint probe for Composio registration.
+
+Fires every candidate endpoint at once over one pooled keep-alive session
+and returns the first 2xx. Each candidate gets its own timeout and a small
+retry budget with exponential backoff for transient failures. 4xx
+responses are final for that candidate.
+
+Non-idempotent requests (POST, PATCH) are only retried when the server
+cannot have acted on them: connection failures and 429/503. A read timeout
+or other 5xx may mean the upload landed, so it is reported, not resent.
+Idempotent methods also retry on read timeouts and any RETRY_STATUSES.
+
+After the first 2xx the remaining in-flight attempts are still collected
+(up to their timeout) so that more than one accepting endpoint — a double
+registration — shows up in the returned attempts.
+
+Point the base URL at a local stand-in server to exercise it offline, e.g.
+COMPOSIO_API_BASE=http://127.0.0.1:8000/api python register-composio.py
+check_composio_probe.py runs the engine against such a stub.
+"""
+import queue
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 429/503 mean "not processed" — the only statuses safe to resend a POST on
+UNSAFE_RETRY_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+NOT_SENT = "not sent — another endpoint already accepted"
+
+
+class Candidate:
+    """One endpoint to try: method, url, body, optional own timeout.
+
+    body may be a JSON-serializable object or pre-encoded JSON bytes; bytes
+    are sent as-is so one encoded payload can be shared across candidates.
+    """
+
+    def __init__(self, method, url, body=None, timeout=None):
+        self.method = method
+        self.url = url
+        self.body = body
+        self.timeout = timeout
+
+
+class Attempt:
+    """Outcome of probing a single candidate (after retries)."""
+
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.status = None
+        self.response = None
+        self.error = None
+        self.tries = 0
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+def make_session(pool_size: int, headers: dict = None) -> requests.Session:
+    """Build a keep-alive session whose pool can hold every candidate at once."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _probe_one(session, candidate, timeout, retries, backoff, stop) -> Attempt:
+    attempt = Attempt(candidate)
+    idempotent = candidate.method.upper() in IDEMPOTENT_METHODS
+    retry_statuses = RETRY_STATUSES if idempotent else UNSAFE_RETRY_STATUSES
+    started = time.monotonic()
+    for n in range(retries + 1):
+        if stop.is_set():
+            if attempt.tries == 0:
+                attempt.error = NOT_SENT
+            break
+        attempt.tries = n + 1
+        try:
+            resp = session.request(
+                candidate.method,
+                candidate.url,
+                json=None if isinstance(candidate.body, bytes) else candidate.body,
+                data=candidate.body if isinstance(candidate.body, bytes) else None,
+                timeout=candidate.timeout or timeout,
+            )
+            attempt.status = resp.status_code
+            attempt.response = resp
+            attempt.error = None
+            if resp.status_code not in retry_statuses:
+                break
+        except requests.exceptions.ConnectionError as e:
+            # Includes ConnectTimeout: the request never reached the server
+            attempt.error = str(e)
+        except requests.exceptions.Timeout:
+            attempt.error = "timed out"
+            if not idempotent:
+                break
+        except requests.exceptions.RequestException as e:
+            attempt.error = str(e)
+            break
+        if n < retries:
+            # Wake early if another candidate already won
+            stop.wait(backoff * (2 ** n))
+    attempt.elapsed = time.monotonic() - started
+    return attempt
+
+
+def probe(candidates, session=None, headers=None, timeout=DEFAULT_TIMEOUT,
+          retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """Probe all candidates concurrently.
+
+    Returns (winner, attempts): winner is the first Attempt with a 2xx status
+    (or None), attempts lists every candidate's Attempt in completion order.
+    Once a winner is in, stragglers get until their own timeout to finish;
+    any still running after that are reported with an error. Check
+    `[a for a in attempts if a.ok]` for duplicate acceptances.
+    """
+    candidates = list(candidates)
+    if not candidates:
+        return None, []
+    own_session = session is None
+    if own_session:
+        session = make_session(len(candidates), headers)
+
+    stop = threading.Event()
+    done = queue.Queue()
+    attempts = []
+    winner = None
+    # Daemon threads: a straggler still blocked past the deadline must not
+    # hold the process open (it stops retrying as soon as `stop` is set)
+    def run(candidate):
+        try:
+            done.put(_probe_one(session, candidate, timeout, retries, backoff, stop))
+        except Exception as e:
+            attempt = Attempt(candidate)
+            attempt.error = str(e)
+            done.put(attempt)
+
+    for c in candidates:
+        threading.Thread(target=run, args=(c,), daemon=True).start()
+
+    deadline = None
+    pending = set(range(len(candidates)))
+    index = {id(c): i for i, c in enumerate(candidates)}
+    while pending:
+        wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            attempt = done.get(timeout=wait)
+        except queue.Empty:
+            break
+        attempts.append(attempt)
+        pending.discard(index[id(attempt.candidate)])
+        if attempt.ok and winner is None:
+            winner = attempt
+            # No new retries; let requests already on the wire answer
+            stop.set()
+            if pending:
+                deadline = time.monotonic() + max(candidates[i].timeout or timeout
+                                                  for i in pending)
+
+    for i in sorted(pending):
+        attempt = Attempt(candidates[i])
+        attempt.error = "still in flight when probing ended — outcome unknown"
+        attempts.append(attempt)
+    if own_session and not pending:
+        session.close()
+    return winner, attempts
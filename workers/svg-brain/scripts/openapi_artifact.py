@@ -0,0 +1,199 @@
+"""Build and load the pre-compiled OpenAPI artifact for svg-brain tooling.
+
+Build step (run after editing docs/openapi.yaml):
+    python scripts/openapi_artifact.py
+
+Resolves every internal $ref, validates the spec once, and writes:
+    docs/openapi.min.json       — minified JSON spec (the exact upload bytes)
+    docs/openapi.min.meta.json  — content hash + source hash + summary
+
+Consumers call load_artifact() and reuse the bytes as-is instead of
+parsing YAML and re-serializing the spec on every run.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import sys
+
+DOCS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "docs")
+SPEC_PATH = os.path.join(DOCS_DIR, "openapi.yaml")
+ARTIFACT_PATH = os.path.join(DOCS_DIR, "openapi.min.json")
+META_PATH = os.path.join(DOCS_DIR, "openapi.min.meta.json")
+
+# Bump whenever resolve_refs(), validate() or the serialization changes so
+# committed artifacts built by older code are treated as stale
+BUILDER_VERSION = 1
+
+HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _lookup(spec: dict, ref: str):
+    if not ref.startswith("#/"):
+        raise ValueError(f"external $ref not supported: {ref}")
+    node = spec
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or part not in node:
+            raise ValueError(f"unresolvable $ref: {ref}")
+        node = node[part]
+    return node
+
+
+def resolve_refs(spec: dict) -> dict:
+    """Return a copy of spec with every internal $ref inlined.
+
+    components.schemas only exists as a $ref target, so it is dropped once
+    inlined. Circular references raise ValueError.
+    """
+    def walk(node, stack):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                ref = node["$ref"]
+                if ref in stack:
+                    raise ValueError(f"circular $ref: {' -> '.join(stack + (ref,))}")
+                return walk(copy.deepcopy(_lookup(spec, ref)), stack + (ref,))
+            return {k: walk(v, stack) for k, v in node.items()}
+        if isinstance(node, list):
+            return [walk(v, stack) for v in node]
+        return node
+
+    resolved = walk(spec, ())
+    components = resolved.get("components")
+    if isinstance(components, dict):
+        components.pop("schemas", None)
+        if not components:
+            resolved.pop("components")
+    return resolved
+
+
+def validate(spec: dict) -> list:
+    """Structural checks on a resolved spec. Returns a list of problems."""
+    problems = []
+    if not str(spec.get("openapi", "")).startswith("3."):
+        problems.append("openapi: must be a 3.x version string")
+    info = spec.get("info") or {}
+    for key in ("title", "version"):
+        if not info.get(key):
+            problems.append(f"info.{key}: missing")
+    paths = spec.get("paths") or {}
+    if not paths:
+        problems.append("paths: empty")
+
+    schemes = (spec.get("components") or {}).get("securitySchemes") or {}
+    for req in spec.get("security") or []:
+        for name in req:
+            if name not in schemes:
+                problems.append(f"security: unknown scheme '{name}'")
+
+    seen_ids = {}
+    for path, item in paths.items():
+        if not path.startswith("/"):
+            problems.append(f"{path}: path must start with '/'")
+        template_params = set(re.findall(r"\{([^}]+)\}", path))
+        for method, op in item.items():
+            if method not in HTTP_METHODS:
+                continue
+            where = f"{method.upper()} {path}"
+            op_id = op.get("operationId")
+            if not op_id:
+                problems.append(f"{where}: missing operationId")
+            elif op_id in seen_ids:
+                problems.append(f"{where}: duplicate operationId '{op_id}' (also {seen_ids[op_id]})")
+            else:
+                seen_ids[op_id] = where
+            if not op.get("responses"):
+                problems.append(f"{where}: no responses")
+            params = (item.get("parameters") or []) + (op.get("parameters") or [])
+            declared = {p.get("name") for p in params if p.get("in") == "path"}
+            for missing in sorted(template_params - declared):
+                problems.append(f"{where}: path parameter '{missing}' not declared")
+            for extra in sorted(declared - template_params):
+                problems.append(f"{where}: path parameter '{extra}' not in template")
+    return problems
+
+
+def build(spec_path: str = SPEC_PATH, artifact_path: str = ARTIFACT_PATH,
+          meta_path: str = META_PATH) -> dict:
+    """Resolve, validate and write the artifact. Returns the meta record."""
+    import yaml
+
+    with open(spec_path, "rb") as f:
+        source = f.read()
+    spec = resolve_refs(yaml.safe_load(source))
+    problems = validate(spec)
+    if problems:
+        raise ValueError("invalid OpenAPI spec:\n  " + "\n  ".join(problems))
+
+    payload = json.dumps(spec, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+    meta = {
+        "builder": BUILDER_VERSION,
+        "sha256": sha256(payload),
+        "bytes": len(payload),
+        "source": os.path.basename(spec_path),
+        "source_sha256": sha256(source),
+        "title": spec["info"]["title"],
+        "version": spec["info"]["version"],
+        "paths": len(spec["paths"]),
+    }
+    with open(artifact_path, "wb") as f:
+        f.write(payload)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+        f.write("\n")
+    return meta
+
+
+def is_stale(spec_path: str = SPEC_PATH, meta_path: str = META_PATH) -> bool:
+    """True if the artifact is missing, was built from a different YAML, or
+    was built by a different BUILDER_VERSION."""
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("builder") != BUILDER_VERSION:
+            return True
+        with open(spec_path, "rb") as f:
+            return meta.get("source_sha256") != sha256(f.read())
+    except (FileNotFoundError, ValueError):
+        return True
+
+
+def load_artifact(artifact_path: str = ARTIFACT_PATH, meta_path: str = META_PATH,
+                  rebuild: bool = True):
+    """Return (payload_bytes, meta), rebuilding first if the artifact is stale.
+
+    The payload hash is re-checked against meta so a hand-edited artifact
+    is never uploaded under the wrong version. Rebuilding needs PyYAML; if
+    it is missing a ValueError asks for the build step instead.
+    """
+    if rebuild and is_stale(meta_path=meta_path):
+        try:
+            build(artifact_path=artifact_path, meta_path=meta_path)
+        except ImportError as e:
+            raise ValueError(f"{artifact_path} is stale and cannot be rebuilt here ({e}); "
+                             "run `npm run build:openapi` and commit the result") from e
+    with open(meta_path) as f:
+        meta = json.load(f)
+    with open(artifact_path, "rb") as f:
+        payload = f.read()
+    if sha256(payload) != meta["sha256"]:
+        raise ValueError(f"{artifact_path}: content hash does not match {meta_path}")
+    return payload, meta
+
+
+if __name__ == "__main__":
+    try:
+        meta = build()
+    except ImportError as e:
+        print(f"ERROR: {e} — install PyYAML (pip install pyyaml) to build the artifact")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    print(f"Built {os.path.relpath(ARTIFACT_PATH)}: {meta['title']} v{meta['version']}")
+    print(f"  {meta['paths']} paths, {meta['bytes']} bytes, sha256 {meta['sha256'][:16]}")
@@ -1,55 +1,104 @@
-"""Register svg-brain as a Composio custom tool via OpenAPI spec upload."""
+"""Register svg-brain as a Composio custom tool via OpenAPI spec upload.
+
+Uploads the pre-compiled artifact (see openapi_artifact.py). Skips the
+upload when the artifact hash matches the version last registered with
+the same API base (COMPOSIO_API_BASE); pass --force to upload anyway.
+"""
 import os
 import sys
 import json
-import yaml
-import requests
+
+from composio_probe import Candidate, probe
+from openapi_artifact import load_artifact
 
 API_KEY = os.environ.get("COMPOSIO_API_KEY")
 if not API_KEY:
     print("ERROR: COMPOSIO_API_KEY not set")
     sys.exit(1)
 
-# Read the OpenAPI spec
-spec_path = os.path.join(os.path.dirname(__file__), "..", "docs", "openapi.yaml")
-with open(spec_path, "r") as f:
-    spec = yaml.safe_load(f)
+# Last successfully registered artifact hash per API base: {base: sha256}
+STATE_PATH = os.path.join(os.path.dirname(__file__), ".composio-registered")
+
+# Override to point at a local stand-in server for offline runs
+BASE = os.environ.get("COMPOSIO_API_BASE", "https://backend.composio.dev/api").rstrip("/")
+
 
-print(f"OpenAPI spec loaded: {spec['info']['title']} v{spec['info']['version']}")
-print(f"Endpoints: {len(spec.get('paths', {}))}")
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}  # missing, or the old bare-hash format: upload again
+    return state if isinstance(state, dict) else {}
+
+
+# Load the pre-compiled spec (rebuilt automatically if openapi.yaml changed)
+try:
+    spec_bytes, meta = load_artifact()
+except ValueError as e:
+    print(f"ERROR: {e}")
+    sys.exit(1)
+
+print(f"OpenAPI spec loaded: {meta['title']} v{meta['version']}")
+print(f"Endpoints: {meta['paths']}")
+print(f"Artifact: {meta['bytes']} bytes, sha256 {meta['sha256'][:16]}")
+
+if "--force" not in sys.argv[1:] and load_state().get(BASE) == meta["sha256"]:
+    print(f"\nUnchanged since last registration with {BASE} — skipping upload (use --force).")
+    sys.exit(0)
 
 HEADERS = {
     "x-api-key": API_KEY,
     "Content-Type": "application/json",
 }
-BASE = "https://backend.composio.dev/api"
 
-# Try v3 endpoints in order of likelihood
+# Request bodies are encoded once around the artifact bytes and reused
+OPENAPI_SPEC_BODY = b'{"openapi_spec":' + spec_bytes + b',"name":"svg_brain"}'
+SPEC_BODY = b'{"spec":' + spec_bytes + b',"name":"svg_brain"}'
+
+# Candidate v3 endpoints — probed concurrently, first 2xx wins
 ENDPOINTS = [
-    ("POST", f"{BASE}/v3/openapi/apps", {"openapi_spec": spec, "name": "svg_brain"}),
-    ("POST", f"{BASE}/v3/apps/openapi", {"openapi_spec": spec, "name": "svg_brain"}),
-    ("POST", f"{BASE}/v3/custom-tools", {"openapi_spec": spec, "name": "svg_brain"}),
-    ("POST", f"{BASE}/v3/tools/custom", {"spec": spec, "name": "svg_brain"}),
+    ("POST", f"{BASE}/v3/openapi/apps", OPENAPI_SPEC_BODY),
+    ("POST", f"{BASE}/v3/apps/openapi", OPENAPI_SPEC_BODY),
+    ("POST", f"{BASE}/v3/custom-tools", OPENAPI_SPEC_BODY),
+    ("POST", f"{BASE}/v3/tools/custom", SPEC_BODY),
 ]
 
-for method, url, body in ENDPOINTS:
-    try:
-        print(f"\nTrying: {method} {url}")
-        resp = requests.request(method, url, headers=HEADERS, json=body, timeout=15)
-        print(f"  Status: {resp.status_code}")
-        if resp.status_code < 500:
-            try:
-                data = resp.json()
-                print(f"  Response: {json.dumps(data, indent=2)[:500]}")
-            except Exception:
-                print(f"  Body: {resp.text[:300]}")
-            if resp.status_code in (200, 201):
-                print("\nSUCCESS! Tool registered.")
-                sys.exit(0)
-    except requests.exceptions.Timeout:
-        print("  Timed out")
-    except Exception as e:
-        print(f"  Error: {e}")
+print(f"\nProbing {len(ENDPOINTS)} endpoints concurrently...")
+winner, attempts = probe(
+    [Candidate(method, url, body) for method, url, body in ENDPOINTS],
+    headers=HEADERS,
+)
+
+for attempt in attempts:
+    c = attempt.candidate
+    print(f"\n{c.method} {c.url}  ({attempt.tries} tries, {attempt.elapsed:.1f}s)")
+    if attempt.status is None:
+        print(f"  Error: {attempt.error or 'no response'}")
+        continue
+    print(f"  Status: {attempt.status}")
+    if attempt.status < 500:
+        resp = attempt.response
+        try:
+            data = resp.json()
+            print(f"  Response: {json.dumps(data, indent=2)[:500]}")
+        except Exception:
+            print(f"  Body: {resp.text[:300]}")
+
+accepted = [a for a in attempts if a.ok]
+if len(accepted) > 1:
+    print(f"\nWARNING: {len(accepted)} endpoints accepted the spec — possible duplicate registration:")
+    for attempt in accepted:
+        print(f"  {attempt.status} {attempt.candidate.url}")
+
+if winner is not None:
+    state = load_state()
+    state[BASE] = meta["sha256"]
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, indent=2)
+        f.write("\n")
+    print(f"\nSUCCESS! Tool registered via {winner.candidate.url}")
+    sys.exit(0)
 
 print("\n---")
 print("Automatic registration did not find a working endpoint.")